@@ -31,6 +31,7 @@ import json
 import argparse
 from datetime import datetime, timedelta
 
+import numpy as np
 import pandas as pd
 
 PROC = "data/processed"
@@ -100,44 +101,25 @@ def left(master, df, on="symbol", cols=None, rename=None):
 
 
 # Borrow-Stress 0–4 aus Short Interest / Borrow
-def borrow_stress(row):
+def borrow_stress(df: pd.DataFrame) -> pd.Series:
     """
     0 = keine Daten
     1 = entspannt (billig & viel verfügbar)
     2 = leicht angespannt
     3 = angespannt
     4 = extrem / Squeeze-Gefahr
+    Spaltenweise über np.select statt apply(axis=1) je Zeile.
     """
-    rate = row.get("borrow_rate")
-    avail = row.get("borrow_avail")
-
-    if pd.isna(rate) or pd.isna(avail):
-        return 0
-    try:
-        r = float(rate)
-        a = float(avail)
-    except Exception:
-        return 0
-
-    if r <= 0.5:
-        rate_score = 1
-    elif r <= 2.0:
-        rate_score = 2
-    elif r <= 10.0:
-        rate_score = 3
-    else:
-        rate_score = 4
-
-    if a >= 1_000_000:
-        avail_score = 1
-    elif a >= 200_000:
-        avail_score = 2
-    elif a >= 50_000:
-        avail_score = 3
-    else:
-        avail_score = 4
-
-    return int(max(rate_score, avail_score))
+    if "borrow_rate" not in df.columns or "borrow_avail" not in df.columns:
+        return pd.Series(0, index=df.index, dtype="int64")
+    r = pd.to_numeric(df["borrow_rate"], errors="coerce").to_numpy(dtype=float)
+    a = pd.to_numeric(df["borrow_avail"], errors="coerce").to_numpy(dtype=float)
+
+    rate_score  = np.select([r <= 0.5, r <= 2.0, r <= 10.0], [1, 2, 3], 4)
+    avail_score = np.select([a >= 1_000_000, a >= 200_000, a >= 50_000], [1, 2, 3], 4)
+    out = np.maximum(rate_score, avail_score)
+    out[np.isnan(r) | np.isnan(a)] = 0
+    return pd.Series(out.astype("int64"), index=df.index)
 
 
 # --------------------------------------------------------------------------- #
@@ -236,7 +218,7 @@ def build(out_path: str):
         master = left(master, shorti, cols=keep)
 
         if "borrow_rate" in master.columns or "borrow_avail" in master.columns:
-            master["borrow_stress"] = master.apply(borrow_stress, axis=1)
+            master["borrow_stress"] = borrow_stress(master)
 
     # ------------------ Peers (Anzahl) ------------------
     if peers is not None and "peer" in peers.columns:
@@ -25,8 +25,21 @@ from pathlib import Path
 import numpy as np
 import pandas as pd
 
+try:
+    from numba import njit, prange
+except Exception:
+    njit = None
 
-def read_csv_auto(path: str) -> pd.DataFrame:
+try:
+    import polars as pl
+except Exception:
+    pl = None
+
+NS_PER_DAY = 86_400_000_000_000
+SIDE_BY_DIR = np.array(["P", "N", "C"])  # indexed by direction + 1
+
+
+def resolve_csv_path(path: str) -> Path:
     p = Path(path)
     if not p.exists():
         if p.suffix != ".gz" and (p.with_suffix(p.suffix + ".gz")).exists():
@@ -35,28 +48,192 @@ def read_csv_auto(path: str) -> pd.DataFrame:
             p = p.with_suffix("")
     if not p.exists():
         raise FileNotFoundError(f"Input not found: {path}")
+    return p
 
+
+def read_csv_auto(path: str, usecols=None) -> pd.DataFrame:
+    p = resolve_csv_path(path)
     if str(p).endswith(".gz"):
         with gzip.open(p, "rt", encoding="utf-8") as f:
-            return pd.read_csv(f)
-    return pd.read_csv(p)
+            return pd.read_csv(f, usecols=usecols)
+    return pd.read_csv(p, usecols=usecols)
 
 
 def to_num(s: pd.Series) -> pd.Series:
     return pd.to_numeric(s, errors="coerce")
 
 
+def to_oi(s: pd.Series) -> pd.Series:
+    # OI counts are whole numbers < 2^31: int32 halves the bytes scanned by
+    # groupby/idxmax vs float64 (strikes stay float64, float32 would mangle 123.45)
+    return to_num(s).fillna(0).astype(np.int32)
+
+
 def to_dt(s: pd.Series) -> pd.Series:
     return pd.to_datetime(s, errors="coerce")
 
 
-def pick_side_and_dir(call_oi: float, put_oi: float):
-    d = int(np.sign(call_oi - put_oi))
-    if d > 0 and call_oi > 0:
-        return d, "C"
-    if d < 0 and put_oi > 0:
-        return d, "P"
-    return 0, "N"
+def _dir_focus_loop(call_oi, put_oi, call_top, put_top, total_top):
+    # one pass: direction = sign(call_oi - put_oi) if the winning side has OI,
+    # focus = strike of that side (C/P) or the total-OI strike (N)
+    n = call_oi.shape[0]
+    direction = np.zeros(n, np.int8)
+    focus = np.empty(n, np.float64)
+    for i in prange(n):
+        c = call_oi[i]
+        p = put_oi[i]
+        if c > p and c > 0:
+            direction[i] = 1
+            focus[i] = call_top[i]
+        elif p > c and p > 0:
+            direction[i] = -1
+            focus[i] = put_top[i]
+        else:
+            focus[i] = total_top[i]
+    return direction, focus
+
+
+def _dir_focus_numpy(call_oi, put_oi, call_top, put_top, total_top):
+    is_c = (call_oi > put_oi) & (call_oi > 0)
+    is_p = (put_oi > call_oi) & (put_oi > 0)
+    direction = is_c.astype(np.int8) - is_p.astype(np.int8)
+    focus = np.where(is_c, call_top, np.where(is_p, put_top, total_top))
+    return direction, focus
+
+
+if njit is not None:
+    dir_and_focus = njit(parallel=True, cache=True)(_dir_focus_loop)
+else:
+    dir_and_focus = _dir_focus_numpy
+
+
+# only these by_strike columns are used; extra greeks/IV columns are never parsed
+BY_STRIKE_COLS = {"symbol", "expiry", "strike", "call_oi", "put_oi", "total_call_oi", "total_put_oi"}
+
+
+def load_by_strike(path: str):
+    """Load + normalize options_oi_by_strike; None if missing/empty/unusable."""
+    if not path or not Path(path).exists():
+        return None
+    try:
+        bs = read_csv_auto(path, usecols=lambda c: str(c).strip() in BY_STRIKE_COLS)
+    except Exception:
+        return None
+    if bs is None or bs.empty:
+        return None
+
+    bs.columns = [str(c).strip() for c in bs.columns]
+
+    # Check if required columns exist
+    required_cols = ["symbol", "expiry", "strike"]
+    if not all(c in bs.columns for c in required_cols):
+        print(f"[INFO] by_strike file missing required columns {required_cols}, skipping strike enrichment")
+        return None
+
+    bs["symbol"] = bs["symbol"].astype(str).str.upper().str.strip().astype("string[pyarrow]")
+    bs["expiry"] = to_dt(bs["expiry"])
+    bs["strike"] = to_num(bs["strike"])
+
+    # Flexible column mapping for OI
+    if "call_oi" in bs.columns:
+        bs["call_oi"] = to_oi(bs["call_oi"])
+    elif "total_call_oi" in bs.columns:
+        bs["call_oi"] = to_oi(bs["total_call_oi"])
+    else:
+        bs["call_oi"] = np.int32(0)
+
+    if "put_oi" in bs.columns:
+        bs["put_oi"] = to_oi(bs["put_oi"])
+    elif "total_put_oi" in bs.columns:
+        bs["put_oi"] = to_oi(bs["total_put_oi"])
+    else:
+        bs["put_oi"] = np.int32(0)
+
+    bs["total_oi"] = bs["call_oi"] + bs["put_oi"]
+    return bs
+
+
+def enrich_strikes(top: pd.DataFrame, bs: pd.DataFrame) -> pd.DataFrame:
+    """Fill call/put/total-OI strike of the picked expiry from by_strike rows."""
+    want_syms = set(top["symbol"].tolist())
+    # normalize expiry once on the int64 ns view (floor to midnight)
+    want_exps = (top["expiry"].values.view("int64") // NS_PER_DAY) * NS_PER_DAY
+    bs_ns = (bs["expiry"].values.view("int64") // NS_PER_DAY) * NS_PER_DAY
+    bs["expiry_norm"] = bs_ns.view("datetime64[ns]")
+
+    bs = bs[bs["symbol"].isin(want_syms)]
+    bs = bs[np.isin(bs["expiry_norm"].values.view("int64"), want_exps)]
+    bs = bs[bs["strike"].notna()]
+    if bs.empty:
+        return top
+
+    # precompute top call/put strikes per (symbol, expiry)
+    def top_strike(sub, col):
+        sub2 = sub.sort_values(col, ascending=False)
+        if sub2.empty:
+            return np.nan
+        return float(sub2.iloc[0]["strike"])
+
+    grp = bs.groupby(["symbol", "expiry_norm"])
+
+    # one keyed lookup per strike column instead of merge + fillna + drop
+    strikes_df = pd.DataFrame({
+        "call_strike_top": grp.apply(lambda x: top_strike(x, "call_oi"), include_groups=False),
+        "put_strike_top": grp.apply(lambda x: top_strike(x, "put_oi"), include_groups=False),
+        "total_strike_top": grp.apply(lambda x: top_strike(x, "total_oi"), include_groups=False),
+    })
+    mi = pd.MultiIndex.from_arrays([top["symbol"].values, want_exps.view("datetime64[ns]")])
+    for col in ("call_strike_top", "put_strike_top", "total_strike_top"):
+        top[col] = strikes_df[col].reindex(mi).values
+
+    return top
+
+
+def write_empty(out_path: str) -> None:
+    Path(out_path).parent.mkdir(parents=True, exist_ok=True)
+    pd.DataFrame(columns=[
+        "symbol","direction","expiry","side","focus_strike","call_strike_top","put_strike_top"
+    ]).to_csv(out_path, index=False)
+
+
+def write_signals(top: pd.DataFrame, out_path: str, with_metrics: bool, bs_ok: bool) -> None:
+    """top: one row per symbol with expiry, call/put/total OI and strike tops."""
+    # direction/side/focus in one fused pass (numba if available)
+    direction, focus = dir_and_focus(
+        top["call_oi"].to_numpy(np.float64),
+        top["put_oi"].to_numpy(np.float64),
+        top["call_strike_top"].to_numpy(np.float64),
+        top["put_strike_top"].to_numpy(np.float64),
+        top["total_strike_top"].to_numpy(np.float64),
+    )
+    top["direction"] = direction
+    top["side"] = SIDE_BY_DIR[direction + 1]
+    top["focus_strike"] = focus
+
+    # ----------------- output -----------------
+    # columnar assembly; symbol is already upper/stripped at load time
+    out_df = pd.DataFrame({
+        "symbol": top["symbol"].values,
+        "direction": top["direction"].values,
+        "expiry": top["expiry"].dt.strftime("%Y-%m-%d").fillna("").values,
+        "side": top["side"].values,
+        "focus_strike": top["focus_strike"].to_numpy(np.float64),
+        "call_strike_top": top["call_strike_top"].to_numpy(np.float64),
+        "put_strike_top": top["put_strike_top"].to_numpy(np.float64),
+    })
+    if with_metrics:
+        out_df["call_oi_expiry"] = top["call_oi"].to_numpy(np.float64)
+        out_df["put_oi_expiry"] = top["put_oi"].to_numpy(np.float64)
+        out_df["total_oi_expiry"] = top["total_oi"].to_numpy(np.float64)
+
+    cols = ["symbol","direction","expiry","side","focus_strike","call_strike_top","put_strike_top"]
+    if with_metrics:
+        cols += ["call_oi_expiry","put_oi_expiry","total_oi_expiry"]
+    out_df = out_df[cols]
+
+    Path(out_path).parent.mkdir(parents=True, exist_ok=True)
+    out_df.to_csv(out_path, index=False)
+    print(f"wrote {out_path} rows={len(out_df)} cols={len(out_df.columns)} (strikes_from_by_strike={bs_ok})")
 
 
 def build_options_signals(
@@ -75,23 +252,23 @@ def build_options_signals(
 
     if exp is None or exp.empty:
         print("[WARN] options_oi_by_expiry leer; schreibe leere options_signals.csv")
-        Path(out_path).parent.mkdir(parents=True, exist_ok=True)
-        pd.DataFrame(columns=[
-            "symbol","direction","expiry","side","focus_strike","call_strike_top","put_strike_top"
-        ]).to_csv(out_path, index=False)
+        write_empty(out_path)
         return
 
-    df = exp.copy()
+    # read_csv_auto returns a freshly parsed frame -> no aliasing, no copy needed
+    df = exp
     df.columns = [str(c).strip() for c in df.columns]
 
     # required columns: symbol, expiry, total_call_oi, total_put_oi (total_oi optional)
-    df["symbol"] = df.get("symbol", "").astype(str).str.upper().str.strip()
+    # normalize once; Arrow-backed strings keep isin/groupby/reindex in Arrow kernels.
+    # Arrow-Cast vor upper/strip: fehlendes Symbol bleibt NA (kein "NAN" via astype(str)) → unten gefiltert
+    df["symbol"] = df.get("symbol", "").astype("string[pyarrow]").str.upper().str.strip()
     df["expiry"] = to_dt(df.get("expiry", pd.Series(dtype="datetime64[ns]")))
 
-    df["call_oi"] = to_num(df.get("total_call_oi", df.get("call_oi", 0))).fillna(0.0)
-    df["put_oi"]  = to_num(df.get("total_put_oi",  df.get("put_oi",  0))).fillna(0.0)
+    df["call_oi"] = to_oi(df.get("total_call_oi", df.get("call_oi", 0)))
+    df["put_oi"]  = to_oi(df.get("total_put_oi",  df.get("put_oi",  0)))
     if "total_oi" in df.columns:
-        df["total_oi"] = to_num(df["total_oi"]).fillna(df["call_oi"] + df["put_oi"])
+        df["total_oi"] = to_num(df["total_oi"]).fillna(df["call_oi"] + df["put_oi"]).astype(np.int32)
     else:
         df["total_oi"] = df["call_oi"] + df["put_oi"]
 
@@ -99,170 +276,144 @@ def build_options_signals(
     df = df[df["expiry"].notna()]
 
     # Use tz-naive timestamp to match expiry dates from CSV
-    today = pd.Timestamp.today().normalize()
-    df["days"] = (df["expiry"] - today).dt.days
-    df = df[df["days"] >= 0]
-
+    # days via one int64 subtract/divide on the ns view (no timedelta array)
+    today_ns = pd.Timestamp.today().normalize().value
+    days = (df["expiry"].values.view("int64") - today_ns) // NS_PER_DAY
+    keep = days >= 0
     if horizon_days > 0:
-        df = df[df["days"] <= horizon_days]
+        keep &= days <= horizon_days
+    df = df[keep]
 
     if df.empty:
         print("[WARN] keine künftigen Expiries im Horizont; schreibe leere Datei")
-        Path(out_path).parent.mkdir(parents=True, exist_ok=True)
-        pd.DataFrame(columns=[
-            "symbol","direction","expiry","side","focus_strike","call_strike_top","put_strike_top"
-        ]).to_csv(out_path, index=False)
+        write_empty(out_path)
         return
 
     # ----------------- pick max total_oi expiry per symbol -----------------
     idx = df.groupby("symbol")["total_oi"].idxmax()
     top = df.loc[idx, ["symbol","expiry","call_oi","put_oi","total_oi"]].copy()
 
-    top["direction"] = 0
-    top["side"] = "N"
-    for i, r in top.iterrows():
-        d, s = pick_side_and_dir(float(r["call_oi"]), float(r["put_oi"]))
-        top.at[i, "direction"] = d
-        top.at[i, "side"] = s
-
     # defaults (in case by_strike missing)
     top["call_strike_top"] = np.nan
     top["put_strike_top"]  = np.nan
-    top["focus_strike"]    = np.nan
+    top["total_strike_top"] = np.nan
 
     # ----------------- optional: enrich strikes from by_strike -----------------
-    bs_ok = False
+    bs = load_by_strike(by_strike_path)
+    bs_ok = bs is not None
+    if bs_ok:
+        top = enrich_strikes(top, bs)
+    write_signals(top, out_path, with_metrics, bs_ok)
+
+
+# ----------------- optional polars engine (--engine polars) -----------------
+def scan_csv_pl(path: str):
+    """Lazy all-Utf8 scan (gz is decompressed eagerly); column names stripped."""
+    p = resolve_csv_path(path)
+    if str(p).endswith(".gz"):
+        with gzip.open(p, "rb") as f:
+            lf = pl.read_csv(f.read(), infer_schema=False).lazy()
+    else:
+        lf = pl.scan_csv(p, infer_schema=False)
+    return lf.rename(lambda c: c.strip())
+
+
+def num_pl(cols, *names, fill=None):
+    """First existing column of names as Float64 (NaN -> null), else fill (scalar or Expr)."""
+    for n in names:
+        if n in cols:
+            e = pl.col(n).str.strip_chars().cast(pl.Float64, strict=False).fill_nan(None)
+            return e if fill is None else e.fill_null(fill)
+    if isinstance(fill, pl.Expr):
+        return fill.cast(pl.Float64)
+    return pl.lit(fill, dtype=pl.Float64)
+
+
+def norm_symbol_pl():
+    return pl.col("symbol").str.to_uppercase().str.strip_chars()
+
+
+def build_options_signals_polars(
+    by_expiry_path: str,
+    by_strike_path: str,
+    out_path: str,
+    horizon_days: int,
+    with_metrics: bool
+) -> None:
+    """Same pipeline as build_options_signals as one lazy polars plan."""
     try:
-        if by_strike_path and Path(by_strike_path).exists():
-            bs = read_csv_auto(by_strike_path)
-            bs_ok = (bs is not None and not bs.empty)
-        else:
-            bs = None
-    except Exception:
-        bs = None
+        lf = scan_csv_pl(by_expiry_path)
+        cols = lf.collect_schema().names()
+    except Exception as e:
+        print(f"[ERR] cannot read {by_expiry_path}: {e}", file=sys.stderr)
+        sys.exit(2)
 
-    if bs_ok:
-        bs = bs.copy()
-        bs.columns = [str(c).strip() for c in bs.columns]
-        
-        # Check if required columns exist
-        required_cols = ["symbol", "expiry", "strike"]
-        if not all(c in bs.columns for c in required_cols):
-            print(f"[INFO] by_strike file missing required columns {required_cols}, skipping strike enrichment")
+    today_ns = pd.Timestamp.today().normalize().value
+    lf = lf.with_columns(
+        norm_symbol_pl().alias("symbol"),
+        pl.col("expiry").str.to_datetime(time_unit="ns", strict=False).alias("expiry"),
+        num_pl(cols, "total_call_oi", "call_oi", fill=0.0).alias("call_oi"),
+        num_pl(cols, "total_put_oi", "put_oi", fill=0.0).alias("put_oi"),
+    ).with_columns(
+        num_pl(cols, "total_oi", fill=pl.col("call_oi") + pl.col("put_oi")).alias("total_oi"),
+    )
+
+    days = (pl.col("expiry").dt.epoch("ns") - today_ns) // NS_PER_DAY
+    keep = pl.col("symbol").is_not_null() & (pl.col("symbol") != "") & (days >= 0)
+    if horizon_days > 0:
+        keep = keep & (days <= horizon_days)
+
+    # max total_oi expiry per symbol (stable sort -> first row on ties, like idxmax)
+    top = (
+        lf.filter(keep)
+        .select("symbol", "expiry", "call_oi", "put_oi", "total_oi")
+        .sort("total_oi", descending=True, maintain_order=True)
+        .group_by("symbol", maintain_order=True)
+        .first()
+        .with_columns(pl.col("expiry").dt.truncate("1d").alias("expiry_norm"))
+    )
+
+    strike_cols = ["call_strike_top", "put_strike_top", "total_strike_top"]
+    bs_ok = False
+    if by_strike_path and Path(by_strike_path).exists():
+        try:
+            bs = scan_csv_pl(by_strike_path)
+            bcols = bs.collect_schema().names()
+            bs_ok = all(c in bcols for c in ("symbol", "expiry", "strike"))
+        except Exception:
             bs_ok = False
-        else:
-            bs["symbol"] = bs.get("symbol", "").astype(str).str.upper().str.strip()
-            bs["expiry"] = to_dt(bs.get("expiry", pd.Series(dtype="datetime64[ns]")))
-            bs["strike"] = to_num(bs.get("strike", np.nan))
-            
-            # Flexible column mapping for OI
-            if "call_oi" in bs.columns:
-                bs["call_oi"] = to_num(bs["call_oi"]).fillna(0.0)
-            elif "total_call_oi" in bs.columns:
-                bs["call_oi"] = to_num(bs["total_call_oi"]).fillna(0.0)
-            else:
-                bs["call_oi"] = 0.0
-                
-            if "put_oi" in bs.columns:
-                bs["put_oi"] = to_num(bs["put_oi"]).fillna(0.0)
-            elif "total_put_oi" in bs.columns:
-                bs["put_oi"] = to_num(bs["total_put_oi"]).fillna(0.0)
-            else:
-                bs["put_oi"] = 0.0
-                
-            bs["total_oi"] = bs["call_oi"] + bs["put_oi"]
-
-            want_syms = set(top["symbol"].tolist())
-            want_exps = set(top["expiry"].dt.normalize().tolist())
-
-            bs = bs[bs["symbol"].isin(want_syms)]
-            bs = bs[bs["expiry"].dt.normalize().isin(want_exps)]
-            bs = bs[bs["strike"].notna()]
-
-            if not bs.empty:
-                # precompute top call/put strikes per (symbol, expiry)
-                def top_strike(sub, col):
-                    sub2 = sub.sort_values(col, ascending=False)
-                    if sub2.empty:
-                        return np.nan
-                    return float(sub2.iloc[0]["strike"])
-
-                # Create normalized expiry for grouping
-                bs["expiry_norm"] = bs["expiry"].dt.normalize()
-                grp = bs.groupby(["symbol", "expiry_norm"])
-                
-                call_top = grp.apply(lambda x: top_strike(x, "call_oi"), include_groups=False).reset_index(name="call_strike_top")
-                put_top = grp.apply(lambda x: top_strike(x, "put_oi"), include_groups=False).reset_index(name="put_strike_top")
-                total_top = grp.apply(lambda x: top_strike(x, "total_oi"), include_groups=False).reset_index(name="total_strike_top")
-
-                # Merge all strike data
-                strikes_df = call_top.merge(put_top, on=["symbol", "expiry_norm"]).merge(total_top, on=["symbol", "expiry_norm"])
-                
-                # Add normalized expiry to top for merging
-                top["expiry_norm"] = top["expiry"].dt.normalize()
-                
-                # Merge strikes back to top
-                top = top.merge(strikes_df, on=["symbol", "expiry_norm"], how="left", suffixes=("", "_new"))
-                
-                # Update columns if merge was successful
-                if "call_strike_top_new" in top.columns:
-                    top["call_strike_top"] = top["call_strike_top_new"].fillna(top["call_strike_top"])
-                    top["put_strike_top"] = top["put_strike_top_new"].fillna(top["put_strike_top"])
-                    top = top.drop(columns=["call_strike_top_new", "put_strike_top_new", "total_strike_top"], errors="ignore")
-                elif "call_strike_top" not in top.columns:
-                    top["call_strike_top"] = strikes_df.set_index(["symbol", "expiry_norm"]).reindex(
-                        pd.MultiIndex.from_arrays([top["symbol"], top["expiry_norm"]])
-                    )["call_strike_top"].values
-                    top["put_strike_top"] = strikes_df.set_index(["symbol", "expiry_norm"]).reindex(
-                        pd.MultiIndex.from_arrays([top["symbol"], top["expiry_norm"]])
-                    )["put_strike_top"].values
-
-                # focus based on side
-                def focus_row(side, c, p, t):
-                    if side == "C":
-                        return c
-                    if side == "P":
-                        return p
-                    return t
-
-                total_strike_map = strikes_df.set_index(["symbol", "expiry_norm"])["total_strike_top"]
-                top["focus_strike"] = [
-                    focus_row(s, c, p, total_strike_map.get((sym, exp), np.nan))
-                    for sym, exp, s, c, p in zip(top["symbol"], top["expiry_norm"], top["side"], top["call_strike_top"], top["put_strike_top"])
-                ]
-                
-                # Clean up temp column
-                top = top.drop(columns=["expiry_norm"], errors="ignore")
+        if not bs_ok:
+            print("[INFO] by_strike unusable, skipping strike enrichment")
 
-    # ----------------- output -----------------
-    out_rows = []
-    for _, r in top.iterrows():
-        exp_str = r["expiry"].strftime("%Y-%m-%d") if pd.notna(r["expiry"]) else ""
-        out_row = {
-            "symbol": str(r["symbol"]).upper().strip(),
-            "direction": int(max(-1, min(1, int(r.get("direction", 0))))),
-            "expiry": exp_str,
-            "side": str(r.get("side", "N")),
-            "focus_strike": (np.nan if pd.isna(r.get("focus_strike")) else float(r.get("focus_strike"))),
-            "call_strike_top": (np.nan if pd.isna(r.get("call_strike_top")) else float(r.get("call_strike_top"))),
-            "put_strike_top": (np.nan if pd.isna(r.get("put_strike_top")) else float(r.get("put_strike_top"))),
-        }
-        if with_metrics:
-            out_row["call_oi_expiry"] = float(r.get("call_oi", np.nan))
-            out_row["put_oi_expiry"] = float(r.get("put_oi", np.nan))
-            out_row["total_oi_expiry"] = float(r.get("total_oi", np.nan))
-        out_rows.append(out_row)
-
-    out_df = pd.DataFrame(out_rows)
+    if bs_ok:
+        strikes = (
+            bs.with_columns(
+                norm_symbol_pl().alias("symbol"),
+                pl.col("expiry").str.to_datetime(time_unit="ns", strict=False).dt.truncate("1d").alias("expiry_norm"),
+                num_pl(bcols, "strike").alias("strike"),
+                num_pl(bcols, "call_oi", "total_call_oi", fill=0.0).alias("call_oi"),
+                num_pl(bcols, "put_oi", "total_put_oi", fill=0.0).alias("put_oi"),
+            )
+            .join(top.select("symbol", "expiry_norm"), on=["symbol", "expiry_norm"], how="semi")
+            .filter(pl.col("strike").is_not_null())
+            .group_by("symbol", "expiry_norm")
+            .agg(
+                pl.col("strike").get(pl.col("call_oi").arg_max()).alias("call_strike_top"),
+                pl.col("strike").get(pl.col("put_oi").arg_max()).alias("put_strike_top"),
+                pl.col("strike").get((pl.col("call_oi") + pl.col("put_oi")).arg_max()).alias("total_strike_top"),
+            )
+        )
+        top = top.join(strikes, on=["symbol", "expiry_norm"], how="left")
+    else:
+        top = top.with_columns([pl.lit(None, dtype=pl.Float64).alias(c) for c in strike_cols])
 
-    cols = ["symbol","direction","expiry","side","focus_strike","call_strike_top","put_strike_top"]
-    if with_metrics:
-        cols += ["call_oi_expiry","put_oi_expiry","total_oi_expiry"]
-    out_df = out_df[cols]
+    out = top.sort("symbol").collect(engine="streaming")
+    if out.height == 0:
+        print("[WARN] keine künftigen Expiries im Horizont; schreibe leere Datei")
+        write_empty(out_path)
+        return
 
-    Path(out_path).parent.mkdir(parents=True, exist_ok=True)
-    out_df.to_csv(out_path, index=False)
-    print(f"wrote {out_path} rows={len(out_df)} cols={len(out_df.columns)} (strikes_from_by_strike={bs_ok})")
+    write_signals(out.drop("expiry_norm").to_pandas(), out_path, with_metrics, bs_ok)
 
 
 def main():
@@ -277,11 +428,20 @@ def main():
                     help="Look-ahead window in days (0/negativ = kein Limit nach oben)")
     ap.add_argument("--with-metrics", action="store_true",
                     help="call_oi_expiry / put_oi_expiry / total_oi_expiry anhängen")
+    ap.add_argument("--engine", choices=["pandas", "polars"], default="pandas",
+                    help="polars = ein lazy/streaming Plan (falls polars installiert)")
     args = ap.parse_args()
 
     horizon = args.horizon_days if args.horizon_days and args.horizon_days > 0 else (365 * 10)
 
-    build_options_signals(
+    build = build_options_signals
+    if args.engine == "polars":
+        if pl is None:
+            print("[WARN] polars nicht installiert; nutze pandas", file=sys.stderr)
+        else:
+            build = build_options_signals_polars
+
+    build(
         by_expiry_path=args.by_expiry,
         by_strike_path=args.by_strike,
         out_path=args.out,
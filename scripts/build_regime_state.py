@@ -8,7 +8,8 @@ os.makedirs("data/processed", exist_ok=True)
 
 def z(s, w=60):
     s = pd.Series(s)
-    return (s - s.rolling(w, min_periods=20).mean())/s.rolling(w, min_periods=20).std()
+    r = s.rolling(w, min_periods=20)  # ein Rolling-Objekt für mean+std
+    return (s - r.mean())/r.std()
 
 def main():
     o = pd.read_csv(FRED, parse_dates=["date"]) if os.path.exists(FRED) else pd.DataFrame()
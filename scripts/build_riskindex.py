@@ -19,33 +19,79 @@ Wichtig:
 """
 
 from __future__ import annotations
-import json, math, sys
+import argparse, json, math, os, sys
 from pathlib import Path
 from datetime import datetime, timezone
 
 import numpy as np
 import pandas as pd
 
+try:
+    from numba import njit, prange
+except Exception:
+    njit = None
+    prange = range
+
+try:
+    import orjson
+except Exception:
+    orjson = None
+
 # ───────────────────────────────────────────────────────────────
 # Pfade
 F_FRED   = Path("data/processed/fred_core.csv.gz")
 F_OAS    = Path("data/processed/fred_oas.csv.gz")
 F_MARKET = Path("data/processed/market_core.csv.gz")
+# RISKINDEX_OAS=0 → OAS-Block (IG/HY) komplett aus, fred_oas wird gar nicht erst gelesen
+USE_OAS  = os.getenv("RISKINDEX_OAS", "1").strip().lower() not in ("0", "false", "no", "off")
 OUTDIR   = Path("data/processed")
 
+# z-Serien im Timeseries-Composite (Reihenfolge wie bisher; ohne rrp/OAS)
+TS_KEYS = ["dgs30", "2s30s", "sofr", "stlfsi", "vix", "usdvol", "dxy", "cr",
+           "vxterm", "10s2s", "10s3m", "relfin", "ust10v", "netliq"]
+
+# Snapshot-Risiken: (Score, Schwelle, Text) – Score > Schwelle → Hinweis
+RISK_RULES = [
+    ("netliq", 60, "Liquidität: knapp → Drawdowns können verstärkt werden."),
+    ("vix",    60, "Volatilität erhöht → Risiko für High-Beta."),
+    ("cr",     60, "Credit Spreads weit → HY/ZYK anfällig."),
+    ("dxy",    60, "USD stark → Gegenwind für EM/Gold."),
+]
+
 # ───────────────────────────────────────────────────────────────
 # IO & Basis-Helper
 
 def _read_df(p: Path) -> pd.DataFrame:
-    """CSV robust lesen: 'date' parsen, Index=DatetimeIndex, Spalten trimmen."""
+    """Eingabe laden (über _parse_csv), geparstes Ergebnis als Parquet-Sidecar cachen."""
     if not p.exists():
         print(f"WARN: Datei fehlt → {p}")
         return pd.DataFrame()
+    # Parquet-Sidecar (fertig geparst) → warme Läufe ohne CSV/gzip/Datums-Parsing
+    pq = p.with_suffix(".parquet")
+    if pq.exists() and pq.stat().st_mtime >= p.stat().st_mtime:
+        try:
+            return pd.read_parquet(pq)
+        except Exception:
+            pass
+    df = _parse_csv(p)
+    if not df.empty:
+        try:
+            df.to_parquet(pq, compression="zstd")
+        except Exception as e:
+            print(f"WARN: Parquet-Cache nicht geschrieben ({pq}): {e}")
+    return df
+
+def _parse_csv(p: Path) -> pd.DataFrame:
+    """CSV robust lesen: 'date' parsen, Index=DatetimeIndex, Spalten trimmen."""
     try:
-        df = pd.read_csv(p, compression="infer")
-    except Exception as e:
-        print(f"WARN: CSV-Read fehlgeschlagen ({p}): {e}")
-        return pd.DataFrame()
+        # pyarrow-Reader: multi-threaded, inkl. gzip; typisiert numerische Spalten direkt
+        df = pd.read_csv(p, engine="pyarrow")
+    except Exception:
+        try:
+            df = pd.read_csv(p, compression="infer")
+        except Exception as e:
+            print(f"WARN: CSV-Read fehlgeschlagen ({p}): {e}")
+            return pd.DataFrame()
     df.columns = [str(c).strip() for c in df.columns]
     date_col = None
     for cand in ("date", "Date", "DATE"):
@@ -59,32 +105,167 @@ def _read_df(p: Path) -> pd.DataFrame:
     except Exception:
         pass
     df = df.rename(columns={date_col: "date"}).set_index("date").sort_index()
-    # alle numerisch (coerce → NaN)
-    for c in df.columns:
-        df[c] = pd.to_numeric(df[c], errors="coerce")
+    # alle numerisch (coerce → NaN); nur nicht-numerische Spalten, in einer Zuweisung
+    obj = [c for c, dt in df.dtypes.items() if dt.kind not in "fi"]
+    if obj:
+        df[obj] = df[obj].apply(pd.to_numeric, errors="coerce")
     return df
 
-def _daily_ffill(df: pd.DataFrame) -> pd.DataFrame:
-    if df.empty:
-        return df
-    idx = pd.date_range(df.index.min(), df.index.max(), freq="D")
-    return df.reindex(idx).ffill()
-
-def _zscore(s: pd.Series, win: int = 252) -> pd.Series | None:
-    if s is None:
-        return None
-    s = pd.to_numeric(s, errors="coerce")
-    mu = s.rolling(win, min_periods=max(20, win//4)).mean()
-    sd = s.rolling(win, min_periods=max(20, win//4)).std(ddof=0)
-    z = (s - mu) / sd
-    return z
-
-def _score_from_z(z: float | None, invert: bool=False) -> float | None:
-    """0..100 aus z (einfach linear; außerhalb 0..100 gecappt)."""
-    if z is None or pd.isna(z):
-        return None
-    s = 50 + 10 * ((-z) if invert else z)
-    return float(max(0, min(100, s)))
+def _write_json(path: Path, obj) -> None:
+    """JSON atomar schreiben (tmp + os.replace) → Leser sehen nie eine halbe Datei."""
+    if orjson is not None:
+        buf = orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+    else:
+        buf = json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(buf)
+    os.replace(tmp, path)
+
+def _rolling_mean_std_loop(a, win, minp, ddof):
+    """Rolling mean/std in einem Durchlauf (Welford add/remove, NaN-tolerant)."""
+    n = a.shape[0]
+    mu = np.full(n, np.nan)
+    sd = np.full(n, np.nan)
+    cnt = 0
+    mean = 0.0
+    m2 = 0.0
+    run = 0         # Länge der Folge gleicher Werte (NaN übersprungen), wie pandas
+    prev = np.nan
+    for i in range(n):
+        x = a[i]
+        if x == x:
+            cnt += 1
+            run = run + 1 if x == prev else 1
+            prev = x
+            d = x - mean
+            mean += d / cnt
+            m2 += d * (x - mean)
+        if i >= win:
+            y = a[i - win]
+            if y == y:
+                cnt -= 1
+                if cnt == 0:
+                    mean = 0.0
+                    m2 = 0.0
+                else:
+                    d = y - mean
+                    mean -= d / cnt
+                    m2 -= d * (y - mean)
+        if cnt >= minp and cnt > ddof:
+            if run >= cnt:
+                # Fenster konstant: exakt Wert/0 statt Drift aus add/remove → z = NaN wie pandas
+                mu[i] = prev
+                sd[i] = 0.0
+            else:
+                mu[i] = mean
+                sd[i] = math.sqrt(max(m2, 0.0) / (cnt - ddof))
+    return mu, sd
+
+_rolling_mean_std = njit(cache=True)(_rolling_mean_std_loop) if njit is not None else None
+
+def _rolling_min_loop(a, win, minp):
+    """Rolling-Min O(N) über monotone Index-Deque (NaN-tolerant wie pandas)."""
+    n = a.shape[0]
+    out = np.full(n, np.nan)
+    dq = np.empty(n, dtype=np.int64)
+    head = 0
+    tail = 0
+    cnt = 0
+    for i in range(n):
+        x = a[i]
+        if x == x:
+            cnt += 1
+            while tail > head and a[dq[tail - 1]] >= x:
+                tail -= 1
+            dq[tail] = i
+            tail += 1
+        if i >= win:
+            y = a[i - win]
+            if y == y:
+                cnt -= 1
+        while tail > head and dq[head] <= i - win:
+            head += 1
+        if cnt >= minp and tail > head:
+            out[i] = a[dq[head]]
+    return out
+
+_rolling_min = njit(cache=True)(_rolling_min_loop) if njit is not None else None
+
+def _ann_sigma(s: pd.Series, win: int = 20, minp: int | None = None,
+               kind: str = "diff", scale: float = 1.0) -> pd.Series:
+    """Annualisierte Rolling-Vol (ddof=1) der Tagesänderungen (kind: "diff" | "pct")."""
+    minp = win if minp is None else minp
+    x = s.to_numpy(dtype=np.float64)
+    d = np.full_like(x, np.nan)
+    # Änderungen direkt auf dem Array (Input ist täglich ge-ffillt → kein pad nötig)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        d[1:] = x[1:] / x[:-1] - 1.0 if kind == "pct" else x[1:] - x[:-1]
+    if _rolling_mean_std is None:
+        sd = pd.Series(d).rolling(win, min_periods=minp).std().to_numpy()
+    else:
+        _, sd = _rolling_mean_std(d, win, minp, 1)
+    return pd.Series(sd * (math.sqrt(252.0) * scale), index=s.index)
+
+def _rolling_mean_std_rows_loop(X, win, minp, ddof):
+    """Rolling mean/std je Zeile einer (K, N)-Matrix; Zeilen unabhängig → prange."""
+    mu = np.empty_like(X)
+    sd = np.empty_like(X)
+    for j in prange(X.shape[0]):
+        m, s = _rolling_mean_std(X[j], win, minp, ddof)
+        mu[j] = m
+        sd[j] = s
+    return mu, sd
+
+_rolling_mean_std_rows = (njit(parallel=True, cache=True)(_rolling_mean_std_rows_loop)
+                          if njit is not None else None)
+
+def _zscore_many(inputs: dict[str, pd.Series], win: int = 252) -> dict[str, pd.Series]:
+    """Alle z-Serien in einem Durchlauf über eine (K, N)-Matrix (gemeinsamer df.index)."""
+    if not inputs:
+        return {}
+    minp = max(20, win//4)
+    if _rolling_mean_std_rows is None:
+        F = pd.DataFrame(inputs)
+        r = F.rolling(win, min_periods=minp)
+        Z = (F - r.mean()) / r.std(ddof=0)
+        return {k: Z[k] for k in inputs}
+    idx = next(iter(inputs.values())).index
+    X = np.vstack([s.to_numpy(dtype=np.float64) for s in inputs.values()])
+    mu, sd = _rolling_mean_std_rows(X, win, minp, 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        Z = (X - mu) / sd
+    return {k: pd.Series(Z[j], index=idx, name=k) for j, k in enumerate(inputs)}
+
+def _score_from_z(z, invert=False) -> list[float | None]:
+    """0..100 aus z (einfach linear; außerhalb 0..100 gecappt) – vektorisiert über alle z.
+
+    z/invert: gleich lange Listen; None/NaN → None.
+    """
+    a = np.array([np.nan if v is None else v for v in z], dtype=np.float64)
+    sign = np.where(np.asarray(invert, dtype=bool), -10.0, 10.0)
+    sc = np.clip(50.0 + sign * a, 0.0, 100.0)
+    return [None if np.isnan(v) else float(v) for v in sc]
+
+def _delta(s: pd.Series, days: int) -> pd.Series:
+    """s - s.shift(days) als Slice-Differenz auf dem Array (keine geshiftete Kopie, kein Align)."""
+    v = s.to_numpy(dtype=np.float64)
+    out = np.full_like(v, np.nan)
+    if 0 < days < len(v):
+        out[days:] = v[days:] - v[:-days]
+    return pd.Series(out, index=s.index, name=s.name)
+
+def _ratio(a: pd.Series, b: pd.Series, index: pd.Index | None = None) -> pd.Series:
+    """a / b auf gemeinsamem Index; Nenner 0/NaN → NaN statt ±inf (kein replace-Pass).
+    Fehlt ein Input (None/NaN-Skalar aus _num(df.get(...))) → NaN-Serie auf `index`."""
+    if not (isinstance(a, pd.Series) and isinstance(b, pd.Series)):
+        if index is None:
+            index = a.index if isinstance(a, pd.Series) else getattr(b, "index", None)
+        return pd.Series(np.nan, index=index, dtype=np.float64)
+    av = a.to_numpy(dtype=np.float64)
+    bv = b.to_numpy(dtype=np.float64)
+    out = np.full(av.shape, np.nan)
+    np.divide(av, bv, out=out, where=(bv != 0) & ~np.isnan(bv))
+    return pd.Series(out, index=a.index)
 
 def _last(s: pd.Series | None) -> float | None:
     if s is None or s.empty:
@@ -92,42 +273,27 @@ def _last(s: pd.Series | None) -> float | None:
     v = s.iloc[-1]
     return None if pd.isna(v) else float(v)
 
+def _last_pct_rank(s: pd.Series | None) -> float | None:
+    """= _last(s.rank(pct=True)) in O(N), ohne die ganze Serie zu ranken (Ties: average)."""
+    if s is None or s.empty:
+        return None
+    a = s.to_numpy(dtype=np.float64)
+    v = a[-1]
+    if np.isnan(v):
+        return None
+    a = a[~np.isnan(a)]
+    return float(((a < v).sum() + ((a == v).sum() + 1) / 2.0) / a.size)
+
 # ───────────────────────────────────────────────────────────────
 # NA-/Type-sichere bool-Utilities für Gates
 
 def _num(x):
     return pd.to_numeric(x, errors="coerce")
 
-def _gt(a, b):
-    return (_num(a) > _num(b)).fillna(False)
-
-def _ge(a, b):
-    return (_num(a) >= _num(b)).fillna(False)
-
-def _lt(a, b):
-    return (_num(a) < _num(b)).fillna(False)
-
-def _le(a, b):
-    return (_num(a) <= _num(b)).fillna(False)
-
-def _or(*masks):
-    m = None
-    for mk in masks:
-        mk = pd.Series(mk).fillna(False)
-        m = mk if m is None else (m | mk)
-    return m.fillna(False)
-
-def _and(*masks):
-    m = None
-    for mk in masks:
-        mk = pd.Series(mk).fillna(False)
-        m = mk if m is None else (m & mk)
-    return m.fillna(False)
-
 # ───────────────────────────────────────────────────────────────
 # Rule-based Gates (keine float|bool Fehler mehr)
 
-def _series_from_preds_df(df: pd.DataFrame) -> pd.Series:
+def _series_from_preds_df(df: pd.DataFrame, pre: dict[str, pd.Series] | None = None) -> pd.Series:
     """
     Baut eine integer-Serie 'risk_gates' aus boolschen Teilregeln:
       - VIX-Term: VIX >= VIX3M  (Stress)
@@ -137,7 +303,9 @@ def _series_from_preds_df(df: pd.DataFrame) -> pd.Series:
       - UST10-Vol hoch (rolling std der Δ > Schwelle) → Risk
       - Rel. Financials schwach (XLF/SPY < SMA200 und < Tief50) → Risk
     Passe die Regeln bei Bedarf an deinen Pine exakt an.
+    `pre`: bereits in main() gerechnete Serien ("10s2s", "10s3m", "cr", "ust10v", "xlf_spy") → kein zweiter Durchlauf.
     """
+    pre = pre or {}
     vix   = _num(df.get("VIX"))
     vix3  = _num(df.get("VIX3M"))
     dgs10 = _num(df.get("DGS10"))
@@ -149,133 +317,133 @@ def _series_from_preds_df(df: pd.DataFrame) -> pd.Series:
     xlf   = _num(df.get("XLF"))
     spy   = _num(df.get("SPY"))
 
-    # 1) VIX-Term (Stress wenn Spot >= 3M)
-    m_vixterm = _ge(vix, vix3)
-
-    # 2) Kurve invertiert
-    curve_10s2  = dgs10 - dgs2
-    curve_10s3m = dgs10 - dgs3m
-    m_curve_inv = _or(_lt(curve_10s2, 0.0), _lt(curve_10s3m, 0.0))
-
-    # 3) Credit: HYG/LQD Momentum 30d < 0 → Risk
-    cr = hyg / lqd
-    cr_chg30 = (cr - cr.shift(30)) * 100.0
-    m_credit = _lt(cr_chg30, 0.0)
-
-    # 4) USD-Stärke (DXY) 30d Δ > 0 → Risk
-    dxy_chg30 = (dxy - dxy.shift(30)) * 100.0
-    m_usd = _gt(dxy_chg30, 0.0)
-
-    # 5) UST10-Vol hoch
-    ust10v = dgs10.diff().rolling(20, min_periods=10).std() * math.sqrt(252.0)
-    m_ust10v = _gt(ust10v, 0.05)  # Schwelle frei
-
-    # 6) Rel. Financials schwach
-    rel = xlf / spy
-    rel_sma200 = rel.rolling(200, min_periods=50).mean()
-    rel_low50  = rel.rolling(50,  min_periods=20).min()
-    m_relfin   = _and(_lt(rel, rel_sma200), _lt(rel, rel_low50))
-
-    score = (
-        m_vixterm.astype(int)
-      + m_curve_inv.astype(int)
-      + m_credit.astype(int)
-      + m_usd.astype(int)
-      + m_ust10v.astype(int)
-      + m_relfin.astype(int)
-    )
-    score.name = "risk_gates"
-    return score
+    # Inputs einmal als float64-Arrays; NaN-Vergleiche sind False → kein fillna nötig.
+    # Fehlende Spalte (None/NaN-Skalar) → NaN-Array: nur dieses Gate bleibt False
+    n = len(df.index)
+    def A(x):
+        if isinstance(x, (pd.Series, np.ndarray)):
+            return np.asarray(x, dtype=np.float64)
+        return np.full(n, np.nan)
+
+    curve_10s2  = pre.get("10s2s")
+    if curve_10s2 is None:
+        curve_10s2 = dgs10 - dgs2
+    curve_10s3m = pre.get("10s3m")
+    if curve_10s3m is None:
+        curve_10s3m = dgs10 - dgs3m
+    cr_chg30 = pre.get("cr")
+    if cr_chg30 is None:
+        cr_chg30 = _delta(_ratio(hyg, lqd, df.index), 30) * 100.0
+    dxy_chg30 = _delta(dxy, 30) if isinstance(dxy, pd.Series) else None
+    ust10v = pre.get("ust10v")
+    if ust10v is None and isinstance(dgs10, pd.Series):
+        ust10v = _ann_sigma(dgs10, 20, minp=10)
+    rel = pre.get("xlf_spy")
+    r = A(rel if rel is not None else _ratio(xlf, spy, df.index))
+    if _rolling_mean_std is not None:
+        rel_sma200 = _rolling_mean_std(r, 200, 50, 0)[0]
+        rel_low50  = _rolling_min(r, 50, 20)
+    else:
+        rel = pd.Series(r)
+        rel_sma200 = rel.rolling(200, min_periods=50).mean().to_numpy()
+        rel_low50  = rel.rolling(50,  min_periods=20).min().to_numpy()
+
+    score = np.zeros(n, dtype=np.int8)
+    with np.errstate(invalid="ignore"):
+        score += A(vix) >= A(vix3)                                 # 1) VIX-Term (Stress wenn Spot >= 3M)
+        score += (A(curve_10s2) < 0.0) | (A(curve_10s3m) < 0.0)    # 2) Kurve invertiert
+        score += A(cr_chg30) < 0.0                                 # 3) Credit: HYG/LQD 30d Δ < 0
+        score += A(dxy_chg30) > 0.0                                # 4) USD-Stärke: DXY 30d Δ > 0
+        score += A(ust10v) > 0.05                                  # 5) UST10-Vol hoch (Schwelle frei)
+        score += (r < rel_sma200) & (r < rel_low50)                # 6) Rel. Financials schwach
+    return pd.Series(score, index=df.index, name="risk_gates")
 
 # ───────────────────────────────────────────────────────────────
 def main() -> int:
+    ap = argparse.ArgumentParser(description="Risk-Index Snapshot + Timeseries bauen.")
+    ap.add_argument("--snapshot-only", action="store_true",
+                    help="nur riskindex_snapshot.json (kein Timeseries-CSV, z. B. Intraday-Updates)")
+    args = ap.parse_args()
+
     OUTDIR.mkdir(parents=True, exist_ok=True)
 
     dfF = _read_df(F_FRED)
     dfM = _read_df(F_MARKET)
-    dfO = _read_df(F_OAS) if F_OAS.exists() else pd.DataFrame()
+    dfO = _read_df(F_OAS) if USE_OAS and F_OAS.exists() else pd.DataFrame()
 
     if dfF.empty and dfM.empty and dfO.empty:
         print("ERROR: Keine Eingabedateien gefunden – breche ohne Snapshot ab.")
         return 0  # weich abort
 
-    # Tagesfrequenz & ffill
-    if not dfF.empty: dfF = _daily_ffill(dfF)
-    if not dfM.empty: dfM = _daily_ffill(dfM)
-    if not dfO.empty: dfO = _daily_ffill(dfO)
-
-    # Spaltennamen vereinheitlichen (UPPER)
-    if not dfF.empty: dfF.columns = [str(c).strip().upper() for c in dfF.columns]
-    if not dfM.empty: dfM.columns = [str(c).strip().upper() for c in dfM.columns]
-    if not dfO.empty: dfO.columns = [str(c).strip().upper() for c in dfO.columns]
-
     # Join
     dfs = [d for d in (dfF, dfM, dfO) if not d.empty]
-    df  = pd.concat(dfs, axis=1).sort_index().ffill()
+    df  = pd.concat(dfs, axis=1).sort_index()
+    df.columns = df.columns.astype(str).str.strip().str.upper()  # Spaltennamen vereinheitlichen, einmal
+    # Tagesfrequenz & ffill einmal auf dem Join statt je Quelle (NaT-Zeilen fallen wie bisher weg)
+    df  = df[df.index.notna()]
+    if not df.empty:
+        df = df.asfreq("D").ffill()
     if df.empty:
         print("WARN: Nach Join keine Daten – Snapshot übersprungen.")
         return 0
 
-    cols_available = set(df.columns)
+    cols_available = frozenset(df.columns)  # einmal hashen statt issubset(df.columns) je Check
 
     # ── Z-Serien (ähnlich Pine-Komponenten) ──
     W = 252
-    S = df.get  # kurz
-
-    z_dgs30  = _zscore(S("DGS30"), W) if "DGS30" in df.columns else None
-
-    if {"DGS30","DGS2"}.issubset(df.columns):
-        z_2s30s = _zscore(_num(S("DGS30")) - _num(S("DGS2")), W)
-    else:
-        z_2s30s = None
-
-    z_sofr30 = _zscore((_num(S("SOFR")) - _num(S("SOFR")).shift(30)) * 100, W) if "SOFR" in df.columns else None
-    rrp_pct  = df["RRPONTSYD"].rank(pct=True) if "RRPONTSYD" in df.columns else None
-    z_stlfsi = _zscore(S("STLFSI4"), W) if "STLFSI4" in df.columns else None
-
-    z_vix    = _zscore(S("VIX"), W) if "VIX" in df.columns else None
-    z_vxterm = _zscore(_num(S("VIX3M")) - _num(S("VIX")), W) if {"VIX3M","VIX"}.issubset(df.columns) else None
-    z_dxy    = _zscore(S("DXY"), W) if "DXY" in df.columns else None
-
-    if "USDJPY" in df.columns:
-        usdvol = _num(S("USDJPY")).pct_change().rolling(20).std() * math.sqrt(252) * 100
-        z_usdvol = _zscore(usdvol, W)
-    else:
-        z_usdvol = None
-
-    if {"HYG","LQD"}.issubset(df.columns):
-        rel = _num(S("HYG")) / _num(S("LQD"))
-        z_cr30 = _zscore((rel - rel.shift(30)) * 100, W)
-    else:
-        z_cr30 = None
-
-    z_10s2  = _zscore(_num(S("DGS10")) - _num(S("DGS2")),   W) if {"DGS10","DGS2"}.issubset(df.columns) else None
-    z_10s3m = _zscore(_num(S("DGS10")) - _num(S("DGS3MO")), W) if {"DGS10","DGS3MO"}.issubset(df.columns) else None
-
-    if {"XLF","SPY"}.issubset(df.columns):
-        relfs = _num(S("XLF")) / _num(S("SPY"))
-        z_relfin30 = _zscore((relfs - relfs.shift(30)) * 100, W)
-    else:
-        z_relfin30 = None
-
-    if "DGS10" in df.columns:
-        ust10v = _num(S("DGS10")).diff().rolling(20, min_periods=10).std() * math.sqrt(252)
-        z_ust10v = _zscore(ust10v, W)
-    else:
-        z_ust10v = None
-
-    if {"WALCL","WTREGEN","RRPONTSYD","WRESBAL"}.issubset(df.columns):
-        netliq = (_num(S("WALCL")) - _num(S("WTREGEN")) - _num(S("RRPONTSYD")) - _num(S("WRESBAL"))) / 1e3
-        z_netliq30 = _zscore(netliq - netliq.shift(30), W)
-    else:
-        z_netliq30 = None
-
-    z_ig_oas = _zscore(S("IG_OAS"), W) if "IG_OAS" in df.columns else None
-    z_hy_oas = _zscore(S("HY_OAS"), W) if "HY_OAS" in df.columns else None
+    S = df.get  # kurz; Spalten sind bereits in _read_df numerisch → kein erneutes _num()
+
+    # Eingangsserien je Score (nur wenn alle Inputs vorhanden); z-Serien danach in einem Batch
+    zin: dict[str, pd.Series] = {}
+    ratios: dict[str, pd.Series] = {}  # einmal gerechnet, von den Gates wiederverwendet
+    # mehrfach genutzte Reihen einmal binden
+    dgs30, dgs10, dgs2, vix = S("DGS30"), S("DGS10"), S("DGS2"), S("VIX")
+    if "DGS30" in cols_available:
+        zin["dgs30"] = dgs30
+    if {"DGS30","DGS2"} <= cols_available:
+        zin["2s30s"] = dgs30 - dgs2
+    if "SOFR" in cols_available:
+        zin["sofr"] = _delta(S("SOFR"), 30) * 100
+    rrp_pct  = _last_pct_rank(df["RRPONTSYD"]) if "RRPONTSYD" in cols_available else None
+    if "STLFSI4" in cols_available:
+        zin["stlfsi"] = S("STLFSI4")
+
+    if "VIX" in cols_available:
+        zin["vix"] = vix
+    if {"VIX3M","VIX"} <= cols_available:
+        zin["vxterm"] = S("VIX3M") - vix
+    if "DXY" in cols_available:
+        zin["dxy"] = S("DXY")
+    if "USDJPY" in cols_available:
+        zin["usdvol"] = _ann_sigma(S("USDJPY"), 20, kind="pct", scale=100.0)
+    if {"HYG","LQD"} <= cols_available:
+        ratios["hyg_lqd"] = _ratio(S("HYG"), S("LQD"))
+        zin["cr"] = _delta(ratios["hyg_lqd"], 30) * 100
+
+    if {"DGS10","DGS2"} <= cols_available:
+        zin["10s2s"] = dgs10 - dgs2
+    if {"DGS10","DGS3MO"} <= cols_available:
+        zin["10s3m"] = dgs10 - S("DGS3MO")
+    if {"XLF","SPY"} <= cols_available:
+        ratios["xlf_spy"] = _ratio(S("XLF"), S("SPY"))
+        zin["relfin"] = _delta(ratios["xlf_spy"], 30) * 100
+    if "DGS10" in cols_available:
+        zin["ust10v"] = _ann_sigma(dgs10, 20, minp=10)
+    if {"WALCL","WTREGEN","RRPONTSYD","WRESBAL"} <= cols_available:
+        netliq = (S("WALCL") - S("WTREGEN") - S("RRPONTSYD") - S("WRESBAL")) / 1e3
+        zin["netliq"] = _delta(netliq, 30)
+
+    if "IG_OAS" in cols_available:
+        zin["ig_oas"] = S("IG_OAS")
+    if "HY_OAS" in cols_available:
+        zin["hy_oas"] = S("HY_OAS")
+
+    # --snapshot-only braucht nur den letzten z-Wert → das letzte Fenster (W Zeilen) reicht
+    zs = _zscore_many({k: v.iloc[-W:] for k, v in zin.items()} if args.snapshot_only else zin, W)
 
     # ── Rule-based Gates (fix) → risk_index_bin ──
     try:
-        gates = _series_from_preds_df(df)
+        gates = _series_from_preds_df(df, pre={**zin, **ratios})
         # 0..100 skalieren (bei 6 Gates → * 100/6)
         max_g = max(1, int(gates.max(skipna=True)) if pd.notna(gates.max()) else 6)
         risk_index_bin = (gates * (100.0 / max(1, max_g))).clip(0, 100)
@@ -285,28 +453,31 @@ def main() -> int:
         risk_index_bin = None
 
     # ── Einzel-Scores (Snapshot) ──
-    scores = {
-        "dgs30"  : _score_from_z(_last(z_dgs30)),
-        "2s30s"  : _score_from_z(_last(z_2s30s)),
-        "sofr"   : _score_from_z(_last(z_sofr30)),
-        "rrp"    : (1.0 - float(_last(rrp_pct))) * 100.0 if rrp_pct is not None and _last(rrp_pct) is not None else None,
-        "stlfsi" : _score_from_z(_last(z_stlfsi)),
-
-        "vix"    : _score_from_z(_last(z_vix)),
-        "usdvol" : _score_from_z(_last(z_usdvol)),
-        "dxy"    : _score_from_z(_last(z_dxy)),
-        "cr"     : _score_from_z(_last(z_cr30)),
-        "vxterm" : _score_from_z(_last(z_vxterm)),
-
-        "10s2s"  : _score_from_z(_last(z_10s2),  invert=True),
-        "10s3m"  : _score_from_z(_last(z_10s3m), invert=True),
-        "relfin" : _score_from_z(_last(z_relfin30), invert=True),
-        "ust10v" : _score_from_z(_last(z_ust10v)),
-        "netliq" : _score_from_z(_last(z_netliq30), invert=True),
-
-        "ig_oas" : _score_from_z(_last(z_ig_oas)) if z_ig_oas is not None else None,
-        "hy_oas" : _score_from_z(_last(z_hy_oas)) if z_hy_oas is not None else None,
+    snap_z = {  # name: (z-Serie, invert)
+        "dgs30"  : (zs.get("dgs30"), False),
+        "2s30s"  : (zs.get("2s30s"), False),
+        "sofr"   : (zs.get("sofr"), False),
+        "rrp"    : (None, False),  # Perzentil, unten gesetzt
+        "stlfsi" : (zs.get("stlfsi"), False),
+
+        "vix"    : (zs.get("vix"), False),
+        "usdvol" : (zs.get("usdvol"), False),
+        "dxy"    : (zs.get("dxy"), False),
+        "cr"     : (zs.get("cr"), False),
+        "vxterm" : (zs.get("vxterm"), False),
+
+        "10s2s"  : (zs.get("10s2s"), True),
+        "10s3m"  : (zs.get("10s3m"), True),
+        "relfin" : (zs.get("relfin"), True),
+        "ust10v" : (zs.get("ust10v"), False),
+        "netliq" : (zs.get("netliq"), True),
+
+        "ig_oas" : (zs.get("ig_oas"), False),
+        "hy_oas" : (zs.get("hy_oas"), False),
     }
+    scores = dict(zip(snap_z, _score_from_z([_last(z) for z, _ in snap_z.values()],
+                                            [inv for _, inv in snap_z.values()])))
+    scores["rrp"] = (1.0 - rrp_pct) * 100.0 if rrp_pct is not None else None
 
     sc_vals = [v for v in scores.values() if v is not None]
     sc_comp = float(sum(sc_vals)/len(sc_vals)) if sc_vals else None
@@ -331,11 +502,7 @@ def main() -> int:
     dur  = "↓" if ((scores.get("dgs30") or 0) > 60 or (scores.get("ust10v") or 0) > 60) else ("↑" if ((scores.get("dgs30") or 50) < 40 and (scores.get("ust10v") or 50) < 40) else "≙")
     one_liner = f"Bias: {bias} | Größe: {size} | Dur {dur}"
 
-    risks = []
-    if (scores.get("netliq") or 0) > 60: risks.append("Liquidität: knapp → Drawdowns können verstärkt werden.")
-    if (scores.get("vix") or 0)   > 60: risks.append("Volatilität erhöht → Risiko für High-Beta.")
-    if (scores.get("cr")  or 0)   > 60: risks.append("Credit Spreads weit → HY/ZYK anfällig.")
-    if (scores.get("dxy") or 0)   > 60: risks.append("USD stark → Gegenwind für EM/Gold.")
+    risks = [msg for k, thr, msg in RISK_RULES if (scores.get(k) or 0) > thr]
 
     snap = {
         "asof": datetime.now(timezone.utc).isoformat(),
@@ -346,40 +513,42 @@ def main() -> int:
         "has_risk_index_bin": risk_index_bin is not None,
         "one_liner": one_liner,
         "risks": risks,
-        "available_columns": sorted(list(cols_available)),
+        "available_columns": sorted(cols_available),
         "notes": [
             "Snapshot nutzt alle verfügbaren Reihen; fehlende Inputs werden ignoriert.",
             "risk_index_bin stammt aus festen Gates (VIXTerm, Curve, Credit, USD, UST10Vol, RelFin)."
         ],
     }
 
-    (OUTDIR / "riskindex_snapshot.json").write_text(json.dumps(snap, ensure_ascii=False, indent=2), encoding="utf-8")
+    _write_json(OUTDIR / "riskindex_snapshot.json", snap)
     print("✔ wrote data/processed/riskindex_snapshot.json")
 
     # ── Timeseries bauen ──
-    zlist = [z for z in (z_dgs30, z_2s30s, z_sofr30, z_stlfsi, z_vix, z_usdvol, z_dxy, z_cr30,
-                         z_vxterm, z_10s2, z_10s3m, z_relfin30, z_ust10v, z_netliq30) if z is not None]
-    rows = []
+    if args.snapshot_only:
+        print("timeseries skipped (--snapshot-only)")
+        return 0
+    zlist = [zs[k] for k in TS_KEYS if k in zs]
     if zlist or (risk_index_bin is not None):
-        idx = df.index
-        for dt in idx:
-            vals = []
-            for z in zlist:
-                try:
-                    v = z.loc[dt]
-                    if pd.notna(v):
-                        vals.append(50 + 10 * v)
-                except KeyError:
-                    pass
-            rec = {"date": dt.date().isoformat()}
-            if len(vals) >= max(6, len(zlist)//3):
-                rec["sc_comp"] = float(sum(vals)/len(vals))
-            if risk_index_bin is not None:
-                rec["risk_index_bin"] = float(risk_index_bin.loc[dt]) if dt in risk_index_bin.index and pd.notna(risk_index_bin.loc[dt]) else np.nan
-            rows.append(rec)
-
-    if rows:
-        out = pd.DataFrame(rows)
+        # vektorisiert: (N, K)-Matrix statt z.loc[dt] je Tag × Serie
+        out = pd.DataFrame({"date": df.index.strftime("%Y-%m-%d")})
+        if risk_index_bin is not None:
+            # Gates laufen auf df.index → positionsgleich, kein Hash-Reindex nötig
+            out["risk_index_bin"] = risk_index_bin.to_numpy(dtype=np.float64)
+        if zlist:
+            # Scores 0..100 brauchen kein float64 → halbe Bandbreite für Maske/Summe
+            # ein vorallozierter Puffer, alle Schritte in-place (keine Zwischen-Matrizen)
+            Z = np.empty((len(df.index), len(zlist)), dtype=np.float32)
+            for j, z in enumerate(zlist):
+                Z[:, j] = z.to_numpy()
+            Z *= np.float32(10.0)
+            Z += np.float32(50.0)
+            nan = np.isnan(Z)
+            cnt = len(zlist) - nan.sum(axis=1)
+            keep = cnt >= max(6, len(zlist)//3)
+            if keep.any():
+                Z[nan] = 0.0
+                sc = Z.sum(axis=1) / np.maximum(cnt, 1).astype(np.float32)
+                out["sc_comp"] = np.where(keep, sc, np.nan)
         out.to_csv(OUTDIR / "riskindex_timeseries.csv", index=False)
         print("✔ wrote data/processed/riskindex_timeseries.csv rows:", len(out))
     else:
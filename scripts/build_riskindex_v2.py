@@ -19,6 +19,11 @@ import logging
 from pathlib import Path
 from datetime import datetime, timezone
 
+try:
+    from numba import njit
+except Exception:
+    njit = None
+
 # --- KONFIGURATION ---
 OUTDIR = Path("data/processed")
 START_DATE = "2007-01-01"
@@ -49,12 +54,33 @@ def fetch_data():
     print(f"Daten geladen: {len(data)} Tage ({data.index.min().date()} bis {data.index.max().date()})")
     return data
 
+def _norm_loop(a, lo, hi, inverse):
+    """Clip + Skalierung auf 0-100 in einem Durchlauf (NaN bleibt NaN wie bei clip)."""
+    out = np.empty_like(a)
+    span = hi - lo
+    for i in range(a.shape[0]):
+        v = a[i]
+        if v < lo:
+            v = lo
+        elif v > hi:
+            v = hi
+        s = (v - lo) / span
+        out[i] = (1.0 - s) * 100 if inverse else s * 100
+    return out
+
+# kein fastmath: NaN-Semantik muss erhalten bleiben
+_norm = njit(cache=True)(_norm_loop) if njit is not None else None
+
 def calc_normalize(series, min_v, max_v, inverse=False):
     """
     Normalisiert Werte auf 0-100 Skala.
     inverse=True: Niedriger Wert ist gut (z.B. VIX).
     inverse=False: Hoher Wert ist gut (z.B. Trend, Credit Ratio).
     """
+    if _norm is not None:
+        a = series.to_numpy(dtype=np.float64)
+        return pd.Series(_norm(a, float(min_v), float(max_v), bool(inverse)), index=series.index)
+
     # Clip Outliers
     clipped = series.clip(min_v, max_v)
     
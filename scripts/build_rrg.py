@@ -32,25 +32,20 @@ SECTORS = {
     "SMH": "Semiconductors"
 }
 
-def calc_rrg(series, window=14):
+QUADRANT_SCORE = {"LEADING": 2, "IMPROVING": 1, "WEAKENING": -1, "LAGGING": -2}
+
+def calc_rrg(rs, window=14):
     # JdK RS-Ratio (Vereinfacht: Normalized Close / Rolling Mean / StdDev)
     # Hier: Einfache Relative Stärke + Momentum
-    
-    # 1. RS = Price / Benchmark
-    rs = series
-    
-    # 2. RS-Ratio = (RS / MA(RS)) * 100
-    # Wir nehmen 100 als Baseline
-    ma = rs.rolling(window).mean()
-    std = rs.rolling(window).std()
-    
-    # Zentrierung um 100
-    rs_ratio = 100 + ((rs - ma) / std)
-    
-    # 3. RS-Momentum = Rate of Change von RS-Ratio
-    # Wir glätten es leicht
+    # rs: DataFrame (eine Spalte je Symbol) → ein Rolling-Aufruf für alle Sektoren
+
+    # RS-Ratio = 100 + (RS - MA(RS)) / Std(RS), Zentrierung um 100
+    r = rs.rolling(window)
+    rs_ratio = 100 + ((rs - r.mean()) / r.std())
+
+    # RS-Momentum = Rate of Change von RS-Ratio
     rs_mom = 100 + (rs_ratio.diff() * 10) # Skalierungsfaktor 10 für Sichtbarkeit
-    
+
     return rs_ratio, rs_mom
 
 def main():
@@ -68,49 +63,33 @@ def main():
         print("Fehler: Keine Daten oder Benchmark fehlt.")
         return
 
-    results = []
-    
-    bench = data[BENCHMARK]
-    
-    for sym, name in SECTORS.items():
-        if sym not in data.columns: continue
-        
-        prices = data[sym]
-        
-        # Relative Stärke Linie
-        rs_line = prices / bench
-        
-        # RRG Werte
-        ratio, mom = calc_rrg(rs_line, window=14)
-        
-        # Letzte Werte
-        curr_ratio = ratio.iloc[-1]
-        curr_mom = mom.iloc[-1]
-        
-        # Quadrant bestimmen
-        quadrant = "Unknown"
-        if curr_ratio > 100 and curr_mom > 100: quadrant = "LEADING"
-        elif curr_ratio > 100 and curr_mom < 100: quadrant = "WEAKENING"
-        elif curr_ratio < 100 and curr_mom < 100: quadrant = "LAGGING"
-        elif curr_ratio < 100 and curr_mom > 100: quadrant = "IMPROVING"
-        
-        # Trend Score (einfach: beide > 100 ist top)
-        score = 0
-        if quadrant == "LEADING": score = 2
-        elif quadrant == "IMPROVING": score = 1
-        elif quadrant == "WEAKENING": score = -1
-        elif quadrant == "LAGGING": score = -2
-        
-        results.append({
-            "Symbol": sym,
-            "Name": name,
-            "RS_Ratio": round(curr_ratio, 2),
-            "RS_Momentum": round(curr_mom, 2),
-            "Quadrant": quadrant,
-            "Score": score
-        })
-        
-    df = pd.DataFrame(results)
+    syms = [sym for sym in SECTORS if sym in data.columns]
+
+    # Relative Stärke Linien aller Sektoren vs Benchmark
+    rs = data[syms].divide(data[BENCHMARK], axis=0)
+
+    # RRG Werte, letzte Zeile
+    ratio, mom = calc_rrg(rs, window=14)
+    curr_ratio = ratio.iloc[-1]
+    curr_mom = mom.iloc[-1]
+
+    # Quadrant bestimmen (NaN → Unknown)
+    r, m = curr_ratio.to_numpy(), curr_mom.to_numpy()
+    quadrant = np.select(
+        [(r > 100) & (m > 100), (r > 100) & (m < 100), (r < 100) & (m < 100), (r < 100) & (m > 100)],
+        ["LEADING", "WEAKENING", "LAGGING", "IMPROVING"],
+        default="Unknown",
+    )
+
+    # Trend Score (einfach: beide > 100 ist top)
+    df = pd.DataFrame({
+        "Symbol": syms,
+        "Name": [SECTORS[s] for s in syms],
+        "RS_Ratio": curr_ratio.round(2).to_numpy(),
+        "RS_Momentum": curr_mom.round(2).to_numpy(),
+        "Quadrant": quadrant,
+    })
+    df["Score"] = df["Quadrant"].map(QUADRANT_SCORE).fillna(0).astype(int)
     df = df.sort_values("Score", ascending=False)
     
     out_path = "data/processed/rrg_sectors.csv"
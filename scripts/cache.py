@@ -10,6 +10,11 @@ import threading
 DB_PATH = os.path.join("data", "cache", "cache.db")
 os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
 _con = sqlite3.connect(DB_PATH, check_same_thread=False)
+# WAL: kein fsync des Rollback-Journals je Commit; NORMAL reicht bei WAL (nur Checkpoint fsynct)
+_con.execute("PRAGMA journal_mode=WAL")
+_con.execute("PRAGMA synchronous=NORMAL")
+_con.execute("PRAGMA temp_store=MEMORY")
+_con.execute("PRAGMA mmap_size=268435456")
 _cur = _con.cursor()
 _cur.execute("""
 CREATE TABLE IF NOT EXISTS kv (
@@ -39,6 +44,17 @@ def set_json(key: str, value):
     )
     _con.commit()
 
+def set_json_many(items):
+    """Schreibt viele (key, value)-Paare in einer Transaktion (ein Commit statt N)."""
+    rows = [(k, json.dumps(v, separators=(",", ":"))) for k, v in items]
+    if not rows:
+        return
+    with _con:
+        _con.executemany(
+            "INSERT OR REPLACE INTO kv(k,v,ts) VALUES (?, ?, strftime('%s','now'))",
+            rows,
+        )
+
 # --- Einfache Rate-Limiter (z.B. für Finnhub) ------------------------------
 
 class RateLimiter:
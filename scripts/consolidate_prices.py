@@ -1,6 +1,11 @@
 import os, glob
 import pandas as pd
 
+try:
+    import polars as pl
+except Exception:
+    pl = None
+
 IN_DIR = "data/prices"
 OUT_DIR = "data/prices"
 SHARD = True   # auf False, wenn ein einziges File gewünscht ist
@@ -14,6 +19,39 @@ def load_one(p):
     df['symbol'] = sym
     return df[['symbol','date','close']]
 
+def scan_one_pl(p):
+    # lazy: nur date/close werden geparst (projection pushdown)
+    sym = os.path.splitext(os.path.basename(p))[0]
+    lf = pl.scan_csv(p, infer_schema=False).rename(lambda c: c.lstrip("\ufeff").strip().lower())
+    return lf.select(
+        pl.lit(sym).alias('symbol'),
+        pl.col('date'),
+        pl.col('close').cast(pl.Float64, strict=False),
+    )
+
+def load_many(lst):
+    """Alle CSVs einer Gruppe → ein Frame [symbol, date, close]."""
+    if pl is not None:
+        # ein Plan, multi-threaded über alle Dateien, ohne Python-Loop + pd.concat
+        return pl.concat([scan_one_pl(p) for p in lst]).collect().to_pandas()
+    parts = [load_one(p) for p in lst]
+    return pd.concat(parts, ignore_index=True)
+
+def up_to_date(outp, lst):
+    """Parquet existiert und ist neuer als jede Quell-CSV → kein erneutes Parsen."""
+    if not os.path.exists(outp):
+        return False
+    return os.path.getmtime(outp) >= max(os.path.getmtime(p) for p in lst)
+
+def write_parquet(df, outp):
+    df['date'] = pd.to_datetime(df['date'])
+    # symbol als Dictionary (category) → wenige Codes statt Python-Strings je Zeile,
+    # Parquet schreibt es dictionary-encoded; close bleibt float64 (Preisgenauigkeit)
+    df['symbol'] = df['symbol'].astype('category')
+    df.sort_values(['symbol','date'], inplace=True)
+    df.to_parquet(outp, index=False)  # Snappy default
+    print(f"→ {outp}: {len(df):,} rows")
+
 def main():
     files = sorted(glob.glob(os.path.join(IN_DIR, "*.csv")))
     if not files:
@@ -27,21 +65,15 @@ def main():
             key = os.path.basename(p)[:1].upper()
             buckets.setdefault(key, []).append(p)
         for key, lst in buckets.items():
-            parts = [load_one(p) for p in lst]
-            df = pd.concat(parts, ignore_index=True)
-            df['date'] = pd.to_datetime(df['date'])
-            df.sort_values(['symbol','date'], inplace=True)
             outp = os.path.join(OUT_DIR, f"shard_{key}.parquet")
-            df.to_parquet(outp, index=False)  # Snappy default
-            print(f"→ {outp}: {len(df):,} rows")
+            if up_to_date(outp, lst):
+                print(f"= {outp}: up to date, skip"); continue
+            write_parquet(load_many(lst), outp)
     else:
-        parts = [load_one(p) for p in files]
-        df = pd.concat(parts, ignore_index=True)
-        df['date'] = pd.to_datetime(df['date'])
-        df.sort_values(['symbol','date'], inplace=True)
         outp = os.path.join(OUT_DIR, "prices.parquet")
-        df.to_parquet(outp, index=False)
-        print(f"→ {outp}: {len(df):,} rows")
+        if up_to_date(outp, files):
+            print(f"= {outp}: up to date, skip"); return
+        write_parquet(load_many(files), outp)
 
 if __name__ == "__main__":
     main()
@@ -95,7 +95,9 @@ def load_summary() -> pd.DataFrame:
 
     # DTE berechnen
     today = datetime.now(timezone.utc).date()
-    df["dte"] = (df["expiry"].dt.date - today).apply(lambda x: x.days)
+    # auf datetime64 rechnen statt Python-date-Objekte + apply je Zeile
+    exp = df["expiry"].dt.tz_localize(None) if df["expiry"].dt.tz is not None else df["expiry"]
+    df["dte"] = (exp.dt.normalize() - pd.Timestamp(today)).dt.days
 
     # Nur zukünftige / aktuelle Verfälle
     df = df[df["dte"] >= 0].copy()
@@ -5,7 +5,7 @@ IN = sorted(glob.glob("data/prices/*.parquet"))
 rows = []
 for p in IN:
     df = pd.read_parquet(p, columns=['symbol','date'])
-    grp = df.groupby('symbol')['date']
+    grp = df.groupby('symbol', observed=True)['date']  # symbol ist category
     tmp = grp.agg(rows='count', first='min', last='max').reset_index()
     tmp['source'] = os.path.basename(p)
     rows.append(tmp)
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# scripts/ ist kein Paket → Skripte direkt importierbar machen
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import build_options_signals as bos
+
+pl = pytest.importorskip("polars")
+
+
+def _inputs(tmp_path, with_total_oi):
+    rng = np.random.default_rng(0)
+    today = pd.Timestamp.today().normalize()
+    rows = []
+    for sym in ["aapl", "MSFT ", "spy", "QQQ"]:
+        for d in (5, 12, 40, 90, 400):
+            c, p = rng.integers(0, 50_000, 2)
+            rows.append({"symbol": sym, "expiry": (today + pd.Timedelta(days=d)).strftime("%Y-%m-%d"),
+                         "total_call_oi": c, "total_put_oi": p, "total_oi": c + p})
+    # Zeile ohne Symbol: beide Engines verwerfen sie (kein "NAN"-Symbol im Output)
+    rows.append({"symbol": None, "expiry": (today + pd.Timedelta(days=30)).strftime("%Y-%m-%d"),
+                 "total_call_oi": 1, "total_put_oi": 2, "total_oi": 3})
+    exp = pd.DataFrame(rows)
+    if not with_total_oi:
+        exp = exp.drop(columns="total_oi")
+    exp.to_csv(tmp_path / "by_expiry.csv", index=False)
+
+    srows = []
+    for r in rows:
+        for k in (90.0, 100.0, 110.0):
+            srows.append({"symbol": r["symbol"], "expiry": r["expiry"], "strike": k,
+                          "call_oi": rng.integers(0, 5_000), "put_oi": rng.integers(0, 5_000)})
+    pd.DataFrame(srows).to_csv(tmp_path / "by_strike.csv", index=False)
+
+
+@pytest.mark.parametrize("with_total_oi", [True, False])
+def test_polars_matches_pandas(tmp_path, with_total_oi):
+    _inputs(tmp_path, with_total_oi)
+    outs = {}
+    for name, build in (("pandas", bos.build_options_signals), ("polars", bos.build_options_signals_polars)):
+        out = tmp_path / f"signals_{name}.csv"
+        build(by_expiry_path=str(tmp_path / "by_expiry.csv"), by_strike_path=str(tmp_path / "by_strike.csv"),
+              out_path=str(out), horizon_days=365, with_metrics=True)
+        outs[name] = pd.read_csv(out)
+    assert len(outs["pandas"]) == 4
+    pd.testing.assert_frame_equal(outs["polars"], outs["pandas"])